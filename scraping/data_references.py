@@ -1,40 +1,41 @@
 # -------------------------------------------------------------
-# Codes for each season page
+# Codes for each season page, season_id is the value of the
+# se query parameter the site uses for that season
 # -------------------------------------------------------------
 seasons = [
     {
         'year': '2017_18',
-        'dropdown_index': 7,
+        'season_id': 79,
         'dropdown_child': 8,
     },
     {
         'year': '2018_19',
-        'dropdown_index': 6,
+        'season_id': 210,
         'dropdown_child': 7,
     },
     {
         'year': '2019_20',
-        'dropdown_index': 5,
+        'season_id': 274,
         'dropdown_child': 6,
     },
     {
         'year': '2020_21',
-        'dropdown_index': 4,
+        'season_id': 363,
         'dropdown_child': 5,
     },
     {
         'year': '2021_22',
-        'dropdown_index': 3,
+        'season_id': 418,
         'dropdown_child': 4,
     },
     {
         'year': '2022_23',
-        'dropdown_index': 2,
+        'season_id': 489,
         'dropdown_child': 3,
     },
     {
         'year': '2023_24',
-        'dropdown_index': 1,
+        'season_id': 578,
         'dropdown_child': 2,
     },
 ]
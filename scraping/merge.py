@@ -1,28 +1,38 @@
 import os
+import numpy as np
 import pandas as pd
 
-tables = os.listdir('scraping/tables_pkl/')
+# Sorted so the seasons are always in the same order
+with os.scandir('scraping/tables_parquet/') as it:
+    tables = sorted(e.name for e in it if e.is_file())
 
-master_df = pd.DataFrame()
+season_dfs = []
 
 for table in tables:
-    table_df = pd.read_pickle(f'scraping/tables_pkl/{table}')
+    table_df = pd.read_parquet(f'scraping/tables_parquet/{table}')
     season = table.split('.')[0]
-    stats_df = pd.read_pickle(f'scraping/stats_pkl/{season}.pkl') 
+    stats_df = pd.read_parquet(f'scraping/stats_parquet/{season}.parquet')
+    # Parquet doesn't keep the pyarrow backed string dtypes, so restore them
+    table_df.index = table_df.index.astype('string[pyarrow]')
+    table_df['Short_name'] = table_df['Short_name'].astype('string[pyarrow]')
+    stats_df.index = stats_df.index.astype('string[pyarrow]')
     season_df = pd.concat([table_df, stats_df], axis=1, join='inner')
-    season_df['Season'] = season
-    season_df['Idx'] = season_df['Short_name'] + season_df['Season'].astype(str)
-    season_df = season_df.set_index('Idx')
-    master_df = pd.concat([master_df, season_df], axis=0)
+    season_df['Season'] = pd.array([season] * len(season_df), dtype='string[pyarrow]')
+    season_df = season_df.set_index((season_df['Short_name'] + season).rename('Idx'))
+    season_dfs.append(season_df)
+
+master_df = pd.concat(season_dfs, axis=0)
 
 # Not calculating these per game
 cols = master_df.columns
 cols = cols.drop(['Short_name', 'Position', 'Played', 'Drawn', 'Season', 'Points', 'Goal_Difference'])
 
 # Calculate the stat per game
-for col in cols:
-    master_df[col] = master_df.apply(lambda x: x[col]/x['Played'], axis=1)
+played = master_df['Played'].to_numpy(dtype=np.float64)
+master_df[cols] = master_df[cols].to_numpy(dtype=np.float64) / played[:, None]
 
+master_df.to_parquet('pl_data.parquet')
+# The R analysis reads the csv
 master_df.to_csv('pl_data.csv', sep=';')
 
 
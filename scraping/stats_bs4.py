@@ -1,73 +1,87 @@
 import os
+import numpy as np
 import pandas as pd
-from bs4 import BeautifulSoup
+import lxml.html
+from concurrent.futures import ProcessPoolExecutor
 from data_references import stats_attributes
 import logging
-import helpers
 
 # Log all messages
 logging.basicConfig(level=logging.INFO)
 
-save_dir = 'scraping/stats_pkl/'
-dir_seasons = os.listdir('scraping/stats_html/')
+save_dir = 'scraping/stats_parquet'
+with os.scandir('scraping/stats_html/') as it:
+    dir_seasons = sorted(e.name for e in it if e.is_dir())
 
-# Remove because these stats aren't available:
-stats_attributes.remove('Caught Opponent Offside')
-stats_attributes.remove('Substitutions On')
-stats_attributes.remove('Fouls')
+# Skip these because the stats aren't available, without changing the shared list
+excluded_attributes = {'Caught Opponent Offside', 'Substitutions On', 'Fouls'}
+attributes = tuple(a for a in stats_attributes if a not in excluded_attributes)
 
-for season in dir_seasons:
-    logging.info(f'Working on season: {season}')
-
-    master_df = pd.DataFrame()
-
-    for attribute in stats_attributes:
-        logging.info(f'Working on statistic: {attribute}')
-        stat_name = attribute.replace(' ', '_')
-        teams_concat = []
-        stats_concat = []
-        # Going through pagination
-        for page in range(1, 3):
-            logging.info(f'Working on page: {page}')
-            teams = []
-            stats = []
-            with open(f'scraping/stats_html/{season}/{attribute}_{page}.html', 'r', encoding='UTF-8') as input:
-                soup = BeautifulSoup(input, 'html.parser')
-            tbody = soup.find('tbody', class_='statsTableContainer')
-            tr = tbody.find_all('tr', class_='table__row')
-            for row in tr:
-                stat = row.find('td', class_='stats-table__main-stat').string
-                team_cell = row.find('td', class_='stats-table__name')
-                team = team_cell.find('a', class_='stats-table__cell-icon-align').contents[2]
-                teams.append(team.replace('\n', ''))
-                stats.append(stat)
-            if (teams != teams_concat):
-                teams_concat.extend(teams)
-                stats_concat.extend(stats)
-        # Remove the space at start and end of teams
-        teams_concat = [x.strip() for x in teams_concat]
-        if (len(teams_concat) == 0) or (len(teams_concat) == 0):
-            logging.warning(f"{stat_name} has no data")
-        stat_df = pd.DataFrame({
-            'Team': teams_concat,
-            'stat': stats_concat
-        })
-        # Brighton is named differently in table and stats due to &
-        stat_df['Team'] = stat_df['Team'].apply(lambda x: helpers.remove_amp(x))
-        stat_df['stat'] = stat_df['stat'].apply(lambda x: helpers.remove_comma(x))
-        stat_df = stat_df.set_index('Team')
-        stat_df.rename(columns = {'stat':stat_name}, inplace = True)
-        master_df = pd.concat([master_df, stat_df], axis=1)
-    master_df = master_df.fillna(0)
-    master_df = master_df.astype(int)
-    # Drop duplicate columns
-    master_df = master_df.drop(['Wins', 'Losses', 'Goals', 'Goals_Conceded'], axis=1)
-    master_df.to_pickle(f'{save_dir}/{season}.pkl')
-
-
-            
+# -------------------------------------------------------------
+# Function for parsing the HTML pages of one statistic in a season,
+# run in a worker process
+def parse_attribute(task):
+    season, attribute = task
+    logging.info(f'Working on statistic: {attribute} ({season})')
+    teams_concat = []
+    stats_concat = []
+    # Going through pagination, skipping the second page if it wasn't saved
+    pages = [1]
+    if os.path.exists(f'scraping/stats_html/{season}/{attribute}_2.html'):
+        pages.append(2)
+    for page in pages:
+        logging.info(f'Working on page: {page}')
+        teams = []
+        stats = []
+        # Parse from bytes, the pages were saved as UTF-8 so there's no need to decode them first
+        with open(f'scraping/stats_html/{season}/{attribute}_{page}.html', 'rb') as input:
+            tree = lxml.html.fromstring(input.read(), parser=lxml.html.HTMLParser(encoding='UTF-8'))
+        tr = tree.xpath('//tbody[contains(@class, "statsTableContainer")]/tr[contains(@class, "table__row")]')
+        for row in tr:
+            stat = row.xpath('.//td[contains(@class, "stats-table__main-stat")]/text()')[0]
+            team = row.xpath('.//td[contains(@class, "stats-table__name")]//a[contains(@class, "stats-table__cell-icon-align")]/text()')[-1]
+            teams.append(team.replace('\n', ''))
+            stats.append(stat)
+        # The scraper saves a second page whenever the pagination control can be clicked,
+        # which is normally a copy of the first, so only add it when the teams differ
+        if (teams != teams_concat):
+            teams_concat.extend(teams)
+            stats_concat.extend(stats)
+    return attribute, teams_concat, stats_concat
+# -------------------------------------------------------------
 
+if __name__ == '__main__':
+    tasks = [(season, attribute) for season in dir_seasons for attribute in attributes]
 
+    # Parse all the pages in parallel, one process per core
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(parse_attribute, tasks))
 
+    # Results come back in the same order as the tasks, so each season is one slice
+    for i, season in enumerate(dir_seasons):
+        logging.info(f'Working on season: {season}')
 
+        stat_dfs = []
 
+        season_results = results[i * len(attributes):(i + 1) * len(attributes)]
+        for attribute, teams_concat, stats_concat in season_results:
+            stat_name = attribute.replace(' ', '_')
+            # Remove the space at start and end of teams
+            teams_concat = [x.strip() for x in teams_concat]
+            if len(teams_concat) == 0:
+                logging.warning(f"{stat_name} has no data in {season}, check scraping/stats_html/{season}/{attribute}_1.html")
+            stat_df = pd.DataFrame({
+                'Team': pd.array(teams_concat, dtype='string[pyarrow]'),
+                'stat': np.fromiter((int(x.replace(',', '')) for x in stats_concat), dtype=np.int32, count=len(stats_concat))
+            })
+            # Brighton is named differently in table and stats due to &
+            stat_df['Team'] = stat_df['Team'].str.replace('&', 'and', regex=False)
+            stat_df = stat_df.set_index('Team')
+            stat_df.rename(columns = {'stat':stat_name}, inplace = True)
+            stat_dfs.append(stat_df)
+        master_df = pd.concat(stat_dfs, axis=1)
+        # Stats are already int32, only teams missing from a stat come back as NaN floats
+        master_df = master_df.fillna(0).astype(np.int32)
+        # Drop duplicate columns
+        master_df = master_df.drop(['Wins', 'Losses', 'Goals', 'Goals_Conceded'], axis=1)
+        master_df.to_parquet(f'{save_dir}/{season}.parquet')
@@ -1,63 +1,73 @@
 import os
-import re
+from concurrent.futures import ThreadPoolExecutor
+import lxml.html
+from lxml import etree
+import numpy as np
 import pandas as pd
 
 dir = 'scraping/tables_html'
-save_dir = 'scraping/tables_pkl'
-seasons = os.listdir(dir)
+save_dir = 'scraping/tables_parquet'
+with os.scandir(dir) as it:
+    seasons = sorted(e.name for e in it if e.is_file())
 
-# Patterns for regex
-tbody_pattern = "<tbody class=\"league-table__tbody isPL\">(.*?)</tbody>"
-team_name_long_pattern = "<span class=\"league-table__team-name league-table__team-name--long long\">(.*?)</span>"
-team_name_short_pattern = "<span class=\"league-table__team-name league-table__team-name--short short\">(.*?)</span>"
-stats_pattern = "</a>   </td> <td>(.*?)</td> <td>(.*?)</td> <td>(.*?)</td> <td>(.*?)</td> <td class=\"hideSmall\">(.*?)</td> <td class=\"hideSmall\">(.*?)</td> <td>(.*?)</td> <td class=\"league-table__points points\">(.*?)</td>"
+# Compiled XPath expressions for the league table
+rows_xpath = etree.XPath('(//tbody[contains(@class, "league-table__tbody")])[1]/tr[.//span[contains(@class, "league-table__team-name--long")]]')
+team_name_long_xpath = etree.XPath('.//span[contains(@class, "league-table__team-name--long")]/text()')
+team_name_short_xpath = etree.XPath('.//span[contains(@class, "league-table__team-name--short")]/text()')
+# The eight cells following the team name: played, won, drawn, lost, goals for, goals against, goal difference, points
+stats_xpath = etree.XPath('./td[.//span[contains(@class, "league-table__team-name--long")]]/following-sibling::td[position() <= 8]')
 
-# Loop through the seasons
-for season in seasons:
-    with open(f'{dir}/{season}', encoding='UTF-8') as file:
+# -------------------------------------------------------------
+# Function for extracting the league table of a season and saving it
+def process(season):
+    # Parse from bytes, the pages were saved as UTF-8 so there's no need to decode them first
+    with open(f'{dir}/{season}', 'rb') as file:
         page = file.read()
-    tbody = re.findall(tbody_pattern, page)
-    team_name_long = re.findall(team_name_long_pattern, tbody[0])
-    team_name_short = re.findall(team_name_short_pattern, tbody[0])
-    stats = re.findall(stats_pattern, tbody[0])
-    # Put data into a list of dicts and then into dataframe
-    i = 0
-    data = []
-    while i <= 19:
-        team_name = team_name_long[i]
-        short_name = team_name_short[i]
-        team_stats = stats[i]
-        data.append({
-            'Team': team_name_long[i],
-            'Short_name': team_name_short[i],
-            'Position': i + 1,
-            'Played': stats[i][0],
-            'Won': stats[i][1],
-            'Drawn': stats[i][2],
-            'Lost': stats[i][3],
-            'Goals_For': stats[i][4],
-            'Goals_Conceded': stats[i][5],
-            'Goal_Difference': stats[i][6],
-            'Points': stats[i][7],
-        })
-        i += 1
-    df = pd.DataFrame(data)
-    df = df.set_index('Team')
-    df = df.astype({
-        'Position': 'int',
-        'Played': 'int',
-        'Won': 'int',
-        'Drawn': 'int',
-        'Lost': 'int',
-        'Goals_For': 'int',
-        'Goals_Conceded': 'int',
-        'Goal_Difference': 'int',
-        'Points': 'int'
+    tree = lxml.html.fromstring(page, parser=lxml.html.HTMLParser(encoding='UTF-8'))
+    rows = rows_xpath(tree)
+    # Put data into a list per column and then into dataframe
+    teams = []
+    short_names = []
+    played = []
+    won = []
+    drawn = []
+    lost = []
+    goals_for = []
+    goals_conceded = []
+    goal_difference = []
+    points = []
+    for row in rows[:20]:
+        teams.append(team_name_long_xpath(row)[0].strip())
+        short_names.append(team_name_short_xpath(row)[0].strip())
+        row_played, row_won, row_drawn, row_lost, row_for, row_conceded, row_difference, row_points = (
+            int(td.text_content()) for td in stats_xpath(row)
+        )
+        played.append(row_played)
+        won.append(row_won)
+        drawn.append(row_drawn)
+        lost.append(row_lost)
+        goals_for.append(row_for)
+        goals_conceded.append(row_conceded)
+        goal_difference.append(row_difference)
+        points.append(row_points)
+    df = pd.DataFrame({
+        'Team': pd.array(teams, dtype='string[pyarrow]'),
+        'Short_name': pd.array(short_names, dtype='string[pyarrow]'),
+        'Position': np.arange(1, len(teams) + 1, dtype=np.int32),
+        'Played': np.array(played, dtype=np.int32),
+        'Won': np.array(won, dtype=np.int32),
+        'Drawn': np.array(drawn, dtype=np.int32),
+        'Lost': np.array(lost, dtype=np.int32),
+        'Goals_For': np.array(goals_for, dtype=np.int32),
+        'Goals_Conceded': np.array(goals_conceded, dtype=np.int32),
+        'Goal_Difference': np.array(goal_difference, dtype=np.int32),
+        'Points': np.array(points, dtype=np.int32),
     })
+    df = df.set_index('Team')
     filename = season.split('.')[0]
-    df.to_pickle(f'{save_dir}/{filename}.pkl')
-
-
-
-
+    df.to_parquet(f'{save_dir}/{filename}.parquet')
+# -------------------------------------------------------------
 
+# lxml releases the GIL while parsing, so threads are enough to parse the seasons in parallel
+with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+    list(executor.map(process, seasons))
@@ -1,89 +1,44 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.firefox.options import Options
+import requests
+import lxml.html
 import helpers
 import logging
 from data_references import seasons
 
-# -------------------------------------------------------------
-# Config - setting some options for the browser
-options = Options()
-options.headless = False
-# Create the browser driver passing in the options
-driver = webdriver.Firefox(options=options)
-# -------------------------------------------------------------
 # Log all messages
 logging.basicConfig(level=logging.INFO)
 load_dotenv()
 
 url = os.getenv('TABLE_URL')
-driver.get(url)
-helpers.random_sleep()
-try: 
-    logging.info('Clicking cookie modal')
-    cookie_modal = WebDriverWait(driver, 30).until(
-        EC.presence_of_element_located((By.ID, "onetrust-accept-btn-handler"))
-    )
-    cookie_modal.click()
-except:
-    logging.critical('Cookie modal')
-    quit()
-logging.info('Cookie modal clicked')
-helpers.random_sleep()
-
-# Click the advert, but is not always present
-try:
-    driver.find_element(By.ID, "advertClose").click()
-except:
-    logging.info('No advert modal')
-
-helpers.random_sleep()
+session = requests.Session()
 
-logging.info('Waiting for the season dropdown')
-try: 
-    statsTable = WebDriverWait(driver, 30).until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, ".dropDown:nth-child(3) > .current"))
-    )
-except:
-    logging.critical('Waiting for season dropdown')
-    quit()
-
-for season in seasons:
+# -------------------------------------------------------------
+# Function for fetching and saving the league table of a season
+def fetch_season(season):
     logging.info(f"Working on season: {season['year']}")
-    logging.info('Clicking season dropdown')
-    # Plus one to indexes we pulled out
-    dropdown_index = season['dropdown_index'] + 1
-    # Select the season we're interested in
-    driver.find_element(By.CSS_SELECTOR, ".dropDown:nth-child(3) > .current").click()
-    driver.find_element(By.CSS_SELECTOR, f".open li:nth-child({dropdown_index})").click()
-    helpers.random_sleep()
-    logging.info('Waiting for table to be visible')
-    try: 
-        statsTable = WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "league-table__tbody"))
-        )
-    except:
-        logging.critical('Table')
-        quit()
-    logging.info('Table ready')
-    helpers.random_sleep()
-    page = driver.page_source
+    # Short pause before each request, with only two workers this keeps it to
+    # a couple of requests every few seconds
+    helpers.random_sleep(1, 3)
+    response = session.get(url, params={'se': season['season_id']}, timeout=30)
+    response.raise_for_status()
+    # Keep the raw bytes, the pages are parsed later as UTF-8
+    page = response.content
+    if b'league-table__tbody' not in page:
+        raise RuntimeError(f"No league table for {season['year']}")
+    # A wrong se id can give another season's table, so check the season
+    # selected in the page's dropdowns is the one requested, e.g. 2017/18
+    season_label = season['year'].replace('_', '/')
+    tree = lxml.html.fromstring(page, parser=lxml.html.HTMLParser(encoding='UTF-8'))
+    current = [x.strip() for x in tree.xpath('//*[contains(@class, "dropDown")]/*[contains(@class, "current")]//text()')]
+    if season_label not in current:
+        raise RuntimeError(f"League table page isn't for {season['year']}, check its season_id")
     logging.info(f"Writing out HTML page {season['year']}")
-    with open(f"scraping/tables_html/{season['year']}.html", 'w', encoding='UTF-8') as output:
+    with open(f"scraping/tables_html/{season['year']}.html", 'wb') as output:
         output.write(page)
     logging.info('Finished season')
+# -------------------------------------------------------------
 
-
-
-
-
-
-
-
-
-
-    
\ No newline at end of file
+with ThreadPoolExecutor(max_workers=2) as executor:
+    list(executor.map(fetch_season, seasons))